@@ -6,53 +6,124 @@ from shiny import reactive, render
 from shiny.express import ui
 import random
 from datetime import datetime
-from collections import deque
-import pandas as pd
-import plotly.express as px
+import numpy as np
 from shinywidgets import render_plotly
-from scipy import stats
 from faicons import icon_svg
 
+# pandas and plotly are imported lazily on first render to keep first paint fast
+
 UPDATE_INTERVAL_SECS: int = 3  # Data update every 3 seconds
 
-DEQUE_SIZE: int = 5  # Max number of entries in deque
-reactive_value_wrapper = reactive.value(deque(maxlen=DEQUE_SIZE))
+DEQUE_SIZE: int = 5  # Max number of entries kept in the ring buffer
+
+RING_CAP: int = 1 << (DEQUE_SIZE - 1).bit_length()  # Ring slots, next power of two >= DEQUE_SIZE
+RING_MASK: int = RING_CAP - 1  # Wraps the head with a bitmask instead of modulo
+
+MAX_PLOT_POINTS: int = 500  # Max points sent to the browser per trace
+
+# Ring buffer: one preallocated array per field (instead of a deque of dicts)
+# Compact dtypes - all simulated ranges fit in int16 / float32
+_ring = {
+    "penguin_population": np.empty(RING_CAP, dtype=np.int16),
+    "food_availability": np.empty(RING_CAP, dtype=np.float32),
+    "chick_count": np.empty(RING_CAP, dtype=np.int16),
+    "timestamp": np.empty(RING_CAP, dtype="datetime64[s]"),
+}
+_head: int = 0  # Next slot to write
+_count: int = 0  # Number of valid entries (at most DEQUE_SIZE)
+
+# Latest entry for the value boxes, updated in place on each tick
+_latest = {
+    "penguin_population": 0,
+    "food_availability": 0.0,
+    "chick_count": 0,
+    "timestamp": None,
+}
+
+# Dedicated generator with its bound random() for the per-tick samples
+_R = random.Random()
+_r = _R.random
 
 # --------------------------------------------
 # Initialize a REACTIVE CALC to generate fake data
 # --------------------------------------------
 
 @reactive.calc()
-def generate_reactive_data():
+def _latest_entry():
+    global _head, _count
+
     # Invalidate this calculation every UPDATE_INTERVAL_SECS
     reactive.invalidate_later(UPDATE_INTERVAL_SECS)
 
     # Simulate new penguin-related data (population, food availability, chick count)
-    penguin_population = random.randint(50, 1000)  # Penguin population count
-    food_availability = round(random.uniform(10, 100), 1)  # Food availability in tons
-    chick_count = random.randint(0, 200)  # Number of chicks
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # Current timestamp
-    
-    # New entry to be appended to the deque
-    new_data_entry = {
-        "penguin_population": penguin_population,
-        "food_availability": food_availability,
-        "chick_count": chick_count,
-        "timestamp": timestamp
-    }
+    _latest["penguin_population"] = 50 + int(_r() * 951)  # Penguin population count
+    _latest["food_availability"] = round(10.0 + 90.0 * _r(), 1)  # Food availability in tons
+    _latest["chick_count"] = int(_r() * 201)  # Number of chicks
+    _latest["timestamp"] = np.datetime64(datetime.now(), "s")  # Current timestamp (formatted only for display)
     
-    # Append the new entry to the deque
-    reactive_value_wrapper.get().append(new_data_entry)
+    # Write the new entry into the ring buffer and advance the head
+    for field, value in _latest.items():
+        _ring[field][_head] = value
+    _head = (_head + 1) & RING_MASK
+    _count = min(_count + 1, DEQUE_SIZE)
+
+    # Return only the latest entry - value boxes don't need a DataFrame
+    return _latest
+
+def _ring_columns():
+    """Return a copy of the last _count ring buffer entries ordered oldest to newest"""
+    start = (_head - _count) & RING_MASK
+    if start + _count <= RING_CAP:
+        # Window doesn't wrap - copy the in-order slice so later ticks can't mutate it
+        return {field: arr[start:start + _count].copy() for field, arr in _ring.items()}
+    return {field: np.concatenate((arr[start:], arr[:_head])) for field, arr in _ring.items()}
+
+def _plot_index(n):
+    """Return evenly strided indices (always keeping the newest point) when n exceeds MAX_PLOT_POINTS"""
+    if n <= MAX_PLOT_POINTS:
+        return slice(None)
+    return np.linspace(0, n - 1, MAX_PLOT_POINTS).astype(np.intp)
+
+def _fill_trend_traces(fig, df):
+    """Set the scatter and trend line traces of fig from df"""
+    if df.empty:
+        return
+
+    y = df["penguin_population"].to_numpy()  # Dependent variable (y-values)
+
+    # Decimate so the payload stays bounded (the fit uses every point)
+    idx = _plot_index(len(df))
+    timestamps = df["timestamp"].to_numpy()[idx]
+
+    # Patch the scatter trace with the latest data
+    fig.data[0].x = timestamps
+    fig.data[0].y = y[idx]
+
+    # A trend line needs at least two points
+    if len(df) >= 2:
+        # Perform linear regression to create a trend line
+        x = np.arange(len(df), dtype=np.float64)  # Independent variable (x-values)
+
+        # Using numpy to calculate the regression line (slope, intercept)
+        slope, intercept = np.polyfit(x, y, 1)
+        best_fit = slope * x + intercept
+
+        fig.data[1].x = timestamps
+        fig.data[1].y = best_fit[idx]
 
-    # Snapshot of the current deque
-    deque_snapshot = reactive_value_wrapper.get()
-    
-    # Convert deque to a DataFrame for easier processing
-    df = pd.DataFrame(deque_snapshot)
-    
-    # Return all the data we need for display
-    latest_data_entry = new_data_entry
-    return deque_snapshot, df, latest_data_entry
+# --------------------------------------------
+# Initialize a REACTIVE CALC to build the DataFrame once per tick
+# --------------------------------------------
+
+@reactive.calc()
+def _latest_df():
+    import pandas as pd
+
+    # Depend on the latest entry so this recomputes once per tick
+    _latest_entry()
+
+    # Wrap the copied ring buffer window in a DataFrame without copying again
+    return pd.DataFrame(_ring_columns(), copy=False)
 
 # --------------------------------------------
 # Define the Shiny UI Page layout with Tabbed Navigation
@@ -84,8 +155,7 @@ with ui.navset_card_tab(id="tab"):
             @render.text
             def display_population():
                 """Get the latest penguin population"""
-                deque_snapshot, df, latest_data_entry = generate_reactive_data()
-                return f"{latest_data_entry['penguin_population']} Penguins"
+                return f"{_latest_entry()['penguin_population']} Penguins"
 
         # Current Chick Count Box
         with ui.value_box(
@@ -96,8 +166,7 @@ with ui.navset_card_tab(id="tab"):
             @render.text
             def display_chicks():
                 """Get the latest chick count"""
-                deque_snapshot, df, latest_data_entry = generate_reactive_data()
-                return f"{latest_data_entry['chick_count']} Chicks"
+                return f"{_latest_entry()['chick_count']} Chicks"
 
         # Current Food Availability Box
         with ui.value_box(
@@ -108,8 +177,7 @@ with ui.navset_card_tab(id="tab"):
             @render.text
             def display_food():
                 """Get the latest food availability"""
-                deque_snapshot, df, latest_data_entry = generate_reactive_data()
-                return f"{latest_data_entry['food_availability']} Tons"
+                return f"{_latest_entry()['food_availability']} Tons"
 
         # Card for Most Recent Data Readings (DataGrid)
         with ui.card(full_screen=True):
@@ -117,55 +185,57 @@ with ui.navset_card_tab(id="tab"):
             @render.data_frame
             def show_data_frame():
                 """Display the current penguin population data as a table"""
-                deque_snapshot, df, latest_entry = generate_reactive_data()
-                pd.set_option('display.width', None)
+                df = _latest_df()
+
+                # Format for display only; the plot keeps the datetime64 column.
+                # float32 food values are widened and re-rounded so 45.3 doesn't show as 45.2999...
+                df = df.assign(
+                    timestamp=df["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S"),
+                    food_availability=df["food_availability"].astype(np.float64).round(1),
+                )
                 return render.DataGrid(df, width="100%", height=400)
 
     # Second Tab: Penguin Population Trend
     with ui.nav_panel("Penguin Population Trend"):
         @render_plotly
         def plot_population_trend():
-            """Create and return a Plotly chart with a trend line for penguin population"""
-            deque_snapshot, df, latest_entry = generate_reactive_data()
-
-            # Ensure the DataFrame is not empty before plotting
-            if not df.empty:
-                # Convert the 'timestamp' column to datetime for better plotting
-                df["timestamp"] = pd.to_datetime(df["timestamp"])
-
-                # Create a scatter plot for penguin population over time
-                fig = px.scatter(df,
-                                 x="timestamp",
-                                 y="penguin_population",
-                                 title="Penguin Population Trend",
-                                 labels={"penguin_population": "Penguin Population", "timestamp": "Time"},
-                                 color_discrete_sequence=["forestgreen"])
-
-                # Perform linear regression to create a trend line
-                sequence = range(len(df))  # Independent variable (x-values)
-                x_vals = list(sequence)
-                y_vals = df["penguin_population"]  # Dependent variable (y-values)
-
-                # Using scipy to calculate the regression line (slope, intercept)
-                slope, intercept, r_value, p_value, std_err = stats.linregress(x_vals, y_vals)
-                df['best_fit_line'] = [slope * x + intercept for x in x_vals]
-
-                # Add the regression line to the plot
-                fig.add_scatter(x=df["timestamp"], y=df['best_fit_line'], mode='lines', name='Trend Line', line=dict(dash='dash', width=3, color='yellow'))
-
-                # Customize plot layout
-                fig.update_layout(
-                    xaxis_title="Time",
-                    yaxis_title="Penguin Population",
-                    template="plotly_dark",  # Use dark theme for plot
-                    showlegend=True,  # Always show legend
-                    xaxis=dict(showline=True, linewidth=1, linecolor='gray', ticks="outside"),
-                    yaxis=dict(showline=True, linewidth=1, linecolor='gray', ticks="outside"),
-                    plot_bgcolor="#2c2c2c",  # Dark background for the plot area
-                    paper_bgcolor="#2c2c2c"  # Dark background for the paper area
-                )
-
-                # Prevent flickering by setting smooth transitions
-                fig.update_traces(marker=dict(size=8, opacity=0.8), line=dict(width=2))
+            """Create the Plotly chart once; _update_population_trend patches its data"""
+            import plotly.graph_objects as go
+
+            # Read the current data without taking a dependency, so this renders only once
+            with reactive.isolate():
+                df = _latest_df()
+
+            # Create a WebGL scatter plot for penguin population over time,
+            # plus a regression line trace, filled in below and patched on each tick
+            fig = go.Figure(data=[
+                go.Scattergl(x=[], y=[], mode='markers', name='Penguin Population', marker=dict(color='forestgreen', size=8, opacity=0.8)),
+                go.Scattergl(x=[], y=[], mode='lines', name='Trend Line', line=dict(dash='dash', width=2, color='yellow')),
+            ])
+
+            # Customize plot layout
+            fig.update_layout(
+                title="Penguin Population Trend",
+                xaxis_title="Time",
+                yaxis_title="Penguin Population",
+                template="plotly_dark",  # Use dark theme for plot
+                showlegend=True,  # Always show legend
+                xaxis=dict(showline=True, linewidth=1, linecolor='gray', ticks="outside"),
+                yaxis=dict(showline=True, linewidth=1, linecolor='gray', ticks="outside"),
+                plot_bgcolor="#2c2c2c",  # Dark background for the plot area
+                paper_bgcolor="#2c2c2c"  # Dark background for the paper area
+            )
+
+            # Draw the current data straight away instead of waiting for the next tick
+            _fill_trend_traces(fig, df)
 
             return fig
+
+        @reactive.effect
+        def _update_population_trend():
+            """Patch the rendered widget's traces with the latest data"""
+            df = _latest_df()
+            widget = plot_population_trend.widget  # Waits (req) until the widget has rendered
+
+            with widget.batch_update():
+                _fill_trend_traces(widget, df)